@@ -16,14 +16,101 @@ __status__      = "Development"
 #                   - Handle package updates that require input from the user, such as needing to
 #                     overwrite an existing configuration file.
 
-import argparse
+import functools
+import hashlib
 import logging
+import os
+import pickle
+import shlex
+import shutil
 import subprocess
+import sys
+import time
 import yaml
 
-from datetime import datetime
-from jsonschema import Draft7Validator
+from concurrent.futures import ThreadPoolExecutor
 from os import path
+from stat import S_IWGRP, S_IWOTH
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Linux pipes hold 64 KiB by default, so read them in chunks of that size
+PIPE_READ_SIZE = 65536
+# Amount of command output to buffer before appending it to a log file
+LOG_BUFFER_SIZE = 1 << 20
+
+# Commands containing any of these characters need a shell
+SHELL_METACHARACTERS = frozenset('|&;<>()$`\\"\'*?[]{}~#=!%\n')
+# The start of files that can be executed without a shell: scripts with a shebang and ELF binaries
+EXECUTABLE_MAGIC = (b'#!', b'\x7fELF')
+
+USAGE = f"""usage: {path.basename(sys.argv[0])} [-h] [--strict] config_path recipe
+
+Execute a software upgrade procedure using a package manager. Output can optionally be recorded if
+required. This is all controlled via a YAML file.
+
+positional arguments:
+  config_path  Path to a logpatch YAML configuration file
+  recipe       The selected recipe to use from the configuration file
+
+options:
+  -h, --help   show this help message and exit
+  --strict     validate every recipe in the configuration file, not just the selected one"""
+
+# Whether child processes need to close file descriptors, see disinherit_fds()
+CLOSE_FDS = True
+
+CACHE_DIRECTORY = path.join(os.environ.get('XDG_CACHE_HOME', path.expanduser('~/.cache')),
+                            'logpatch')
+
+# The description has been left in for each schema property as a form of documentation
+RECIPE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'log_directory': {
+            # 'description': "The parent directory to write log files",
+            'type': 'string'
+        },
+        'log_package_version_cmd': {
+            # 'description': "Set to true to log package versions before and after patching, false to not",
+            'type': 'boolean'
+        },
+        'log_patch_cmd':{
+            # 'description': "Set to true to log patch command output, false to not",
+            'type': 'boolean'
+        },
+        'name': {
+            # 'description': "The name of this recipe",
+            'type': 'string'
+        },
+        'patch_cmd': {
+            # 'description': "The package manager command to install patches",
+            'type': 'string'
+        },
+        'prefetch_cmd': {
+            # 'description': "Optional command that prepares for patch_cmd without changing installed packages",
+            'type': 'string'
+        },
+        'package_version_cmd': {
+            # 'description': "The package manager command to record package versions",
+            'type': 'string'
+        }
+    },
+    'required': ['log_directory', 'log_package_version_cmd', 'log_patch_cmd', 'name',
+                 'patch_cmd', 'package_version_cmd']
+}
+CONF_SCHEMA = {
+    'type': 'object',
+    'additionalProperties': RECIPE_SCHEMA
+}
+SCHEMAS = {
+    'conf': CONF_SCHEMA,
+    'recipe': RECIPE_SCHEMA
+}
 
 def datetime_now_utc():
     """Return the current datetime (UTC) following ISO 8601.
@@ -31,54 +118,55 @@ def datetime_now_utc():
     Returns:
         str : A ISO 8601 string representation of the current datetime (UTC)
     """
-    return datetime.utcnow().strftime('%Y%m%dT%H%M%S.%fZ')
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    now = time.gmtime(seconds)
+    return f"{now.tm_year:04d}{now.tm_mon:02d}{now.tm_mday:02d}T" \
+           f"{now.tm_hour:02d}{now.tm_min:02d}{now.tm_sec:02d}.{nanoseconds // 1000:06d}Z"
+
+@functools.lru_cache(maxsize=None)
+def get_validator(schema_name):
+    """Build the validator for a schema the first time it is needed.
+
+    fastjsonschema generates Python code specialised for the schema, jsonschema is used if it isn't
+    installed. Neither is imported until now so that runs which don't validate anything, such as
+    --help or a configuration cache hit, don't pay for it.
 
-def validate_schema_conf(conf) -> int:
-    """Validate the schema of a deserialised YAML configuration document.
-    
     Args:
-        conf (dict) : The configuration that will be validated
- 
+        schema_name (str)   : A key of SCHEMAS
+
     Returns:
-        int         : 1 if the schema has validation errors, otherwise 0
+        A fastjsonschema validation function or a jsonschema Draft7Validator
     """
-    # The description has been left in for each schema property as a form of documentation
-    schema = {
-        'type': 'object',
-        'additionalProperties': {
-            'type': 'object',
-            'properties': {
-                'log_directory': {
-                    # 'description': "The parent directory to write log files",
-                    'type': 'string'
-                },
-                'log_package_version_cmd': {
-                    # 'description': "Set to true to log package versions before and after patching, false to not",
-                    'type': 'boolean'
-                },
-                'log_patch_cmd':{
-                    # 'description': "Set to true to log patch command output, false to not",
-                    'type': 'boolean'
-                },
-                'name': {
-                    # 'description': "The name of this recipe",
-                    'type': 'string'
-                },
-                'patch_cmd': {
-                    # 'description': "The package manager command to install patches",
-                    'type': 'string'
-                },
-                'package_version_cmd': {
-                    # 'description': "The package manager command to record package versions",
-                    'type': 'string'
-                }
-            },
-            'required': ['log_directory', 'log_package_version_cmd', 'log_patch_cmd', 'name',
-                     'patch_cmd', 'package_version_cmd']
-        }
-    }
-    validator = Draft7Validator(schema)
-    errors = list(validator.iter_errors(conf))
+    schema = SCHEMAS[schema_name]
+    try:
+        import fastjsonschema
+    except ImportError:
+        from jsonschema import Draft7Validator
+        Draft7Validator.check_schema(schema)
+        return Draft7Validator(schema)
+    return fastjsonschema.compile(schema)
+
+def validate_schema(schema_name, document) -> int:
+    """Validate a deserialised YAML document and log any errors found.
+
+    Args:
+        schema_name (str)   : A key of SCHEMAS
+        document (dict)     : The document that will be validated
+
+    Returns:
+        int                 : 1 if the schema has validation errors, otherwise 0
+    """
+    validator = get_validator(schema_name)
+    if hasattr(validator, 'iter_errors'):
+        errors = list(validator.iter_errors(document))
+    else:
+        # The generated validator stops at the first error it finds
+        from fastjsonschema import JsonSchemaException
+        try:
+            validator(document)
+            errors = []
+        except JsonSchemaException as error:
+            errors = [error]
     if len(errors) == 0:
         return 0
     for error in errors:
@@ -86,23 +174,232 @@ def validate_schema_conf(conf) -> int:
                         f"{error}")
     return 1
 
+def validate_schema_conf(conf) -> int:
+    """Validate the schema of a deserialised YAML configuration document.
+    
+    Args:
+        conf (dict) : The configuration that will be validated
+ 
+    Returns:
+        int         : 1 if the schema has validation errors, otherwise 0
+    """
+    return validate_schema('conf', conf)
+
+def validate_schema_recipe(recipe) -> int:
+    """Validate the schema of a single recipe from a deserialised YAML configuration document.
+
+    Args:
+        recipe (dict)   : The recipe that will be validated
+
+    Returns:
+        int             : 1 if the schema has validation errors, otherwise 0
+    """
+    return validate_schema('recipe', recipe)
+
+def conf_cache_key(config_path):
+    """Build the key that identifies a particular revision of a configuration file.
+
+    Args:
+        config_path (str)   : Path to a logpatch YAML configuration file
+
+    Returns:
+        tuple               : The absolute path, modification time (ns) and size of the file
+    """
+    stat = os.stat(config_path)
+    return (path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
+
+def conf_cache_file(key):
+    """Return the path of the cache file for a configuration cache key.
+
+    There is one cache file per configuration file, so storing a new revision replaces the old one.
+
+    Args:
+        key (tuple) : A key returned by conf_cache_key()
+
+    Returns:
+        str         : The path of the pickle file that holds the cached configuration
+    """
+    digest = hashlib.blake2b(key[0].encode()).hexdigest()
+    return path.join(CACHE_DIRECTORY, f"{digest}.pickle")
+
+def cache_stat_is_trusted(stat):
+    """Check that a cache file or directory can only have been written by this user.
+
+    The cache is unpickled and skips validation, and this program normally runs as root. A cache
+    owned or writable by anyone else could be used to run arbitrary code or swap recipe commands.
+
+    Args:
+        stat (os.stat_result)   : The status of the cache file or directory
+
+    Returns:
+        bool                    : True if the cache can be trusted, otherwise False
+    """
+    return stat.st_uid == os.geteuid() and not stat.st_mode & (S_IWGRP | S_IWOTH)
+
+def load_cached_conf(key):
+    """Load a previously parsed configuration, and the recipes validated in it, from the cache.
+
+    Args:
+        key (tuple) : A key returned by conf_cache_key()
+
+    Returns:
+        tuple       : The cached configuration and a frozenset of the names of its validated
+                      recipes, or (None, frozenset()) if there is no usable cache entry
+    """
+    try:
+        if not cache_stat_is_trusted(os.stat(CACHE_DIRECTORY)):
+            logger.warning(f"Ignoring untrusted configuration cache directory: {CACHE_DIRECTORY}")
+            return None, frozenset()
+        with open(conf_cache_file(key), 'rb') as f_in:
+            if not cache_stat_is_trusted(os.fstat(f_in.fileno())):
+                logger.warning(f"Ignoring untrusted configuration cache file: {f_in.name}")
+                return None, frozenset()
+            cached_key, conf, validated_recipes = pickle.load(f_in)
+    except Exception as excpt:
+        # Unreadable, corrupt or wrongly shaped cache entries can raise almost anything when
+        # unpickled, but they only ever mean the configuration needs to be parsed again
+        logger.debug(f"Configuration cache miss: {excpt!r}")
+        return None, frozenset()
+    if cached_key != key:
+        return None, frozenset()
+    return conf, validated_recipes
+
+def store_cached_conf(key, conf, validated_recipes):
+    """Store a parsed configuration, and the recipes validated in it, in the cache.
+
+    Failing to write the cache is not fatal, the configuration will just be parsed again next time.
+
+    Args:
+        key (tuple)                 : A key returned by conf_cache_key()
+        conf (dict)                 : The configuration to cache
+        validated_recipes (set)     : The names of the recipes in conf that passed validation
+    """
+    cache_file = conf_cache_file(key)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIRECTORY, mode=0o700, exist_ok=True)
+        if not cache_stat_is_trusted(os.stat(CACHE_DIRECTORY)):
+            logger.warning(f"Not writing to untrusted configuration cache directory: {CACHE_DIRECTORY}")
+            return
+        with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'wb') as f_out:
+            pickle.dump((key, conf, frozenset(validated_recipes)), f_out, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except (OSError, pickle.PicklingError) as excpt:
+        logger.debug(f"Unable to write configuration cache: {excpt}")
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+
+def disinherit_fds() -> bool:
+    """Stop file descriptors that this program inherited from being passed on to commands.
+
+    Python creates its own file descriptors non-inheritable, but descriptors inherited from the
+    parent (e.g. cron, flock or a shell redirect) are not. This should be called once at startup.
+
+    Returns:
+        bool    : True if every descriptor above stderr is now non-inheritable, otherwise False
+    """
+    try:
+        fds = [int(fd) for fd in os.listdir('/proc/self/fd')]
+    except OSError:
+        return False
+    for fd in fds:
+        if fd > 2:
+            try:
+                os.set_inheritable(fd, False)
+            except OSError:
+                # The descriptor used to list /proc/self/fd has already been closed
+                pass
+    return True
+
+def is_directly_executable(executable) -> bool:
+    """Check whether a file can be executed without a shell.
+
+    A shell runs executable files that lack a shebang as shell scripts, but exec() rejects them.
+
+    Args:
+        executable (str)    : The path of an executable file
+
+    Returns:
+        bool                : True if the file is a script with a shebang or an ELF binary
+    """
+    try:
+        with open(executable, 'rb') as f_in:
+            return f_in.read(4).startswith(EXECUTABLE_MAGIC)
+    except OSError:
+        return False
+
+def popen_args(cmd):
+    """Work out the keyword arguments to pass to subprocess for a command.
+
+    Simple commands are executed directly, saving the cost of starting a shell just to exec them.
+    The arguments are also chosen so that subprocess can start the command with posix_spawn()
+    instead of fork() and exec(): the executable is given as a path and, once disinherit_fds() has
+    succeeded, file descriptors are not closed in the child.
+
+    Anything that isn't a simple command for an executable file found in the PATH, such as shell
+    syntax, builtins and scripts without a shebang, is still executed by the shell.
+
+    >>> popen_args('sh -c true')['args']
+    ['sh', '-c', 'true']
+    >>> popen_args('apt update && apt full-upgrade -y')['shell']
+    True
+    >>> popen_args('command -v apt')['shell']
+    True
+    >>> popen_args('no-such-command --version')['shell']
+    True
+
+    Args:
+        cmd (str)   : A command to execute
+
+    Returns:
+        dict        : Keyword arguments for subprocess.Popen()
+    """
+    if SHELL_METACHARACTERS.isdisjoint(cmd):
+        argv = shlex.split(cmd)
+        executable = shutil.which(argv[0]) if argv else None
+        if executable is not None and is_directly_executable(executable):
+            return {'args': argv, 'executable': executable, 'close_fds': CLOSE_FDS}
+    return {'args': cmd, 'shell': True, 'close_fds': CLOSE_FDS}
+
 def subproc_Popen(cmd):
     """A helper function for executing a command and return the STDOUT and STDERR via yield.
     
     This function is based on: From https://stackoverflow.com/a/4417735
 
+    Output is yielded as raw chunks of bytes, exactly as the command wrote them, so that callers
+    can pass it straight on to file descriptors without decoding it. Each chunk is a view of a
+    single reused buffer and is only valid until the next chunk is requested.
+
     Args:
         cmd (str) : A command to execute in a shell
     """
-    popen = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                             universal_newlines=True)
-    for stdout_line in iter(popen.stdout.readline, ""):
-        yield stdout_line
+    # The pipe is unbuffered so that each read goes straight from the pipe into the buffer
+    popen = subprocess.Popen(**popen_args(cmd), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                             bufsize=0)
+    buffer = memoryview(bytearray(PIPE_READ_SIZE))
+    while True:
+        n_bytes = popen.stdout.readinto(buffer)
+        if not n_bytes:
+            break
+        yield buffer[:n_bytes]
     popen.stdout.close()
     return_code = popen.wait()
     if return_code:
         raise subprocess.CalledProcessError(return_code, cmd)
 
+def write_all(fd, data):
+    """Write all of the data to a file descriptor, retrying after short writes.
+
+    Args:
+        fd (int)        : The file descriptor to write to
+        data (bytes)    : The data to write
+    """
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
 def execute(cmd, log_file=''):
     """Execute a command and print the output to the terminal and optionally append to a file.
     
@@ -110,40 +407,85 @@ def execute(cmd, log_file=''):
         cmd (str)       : A command to execute in a shell
         log_file (str)  : The path of the file to append a command's output to
     """
+    # Anything already printed must reach the terminal before the command's output does
+    sys.stdout.flush()
+    stdout_fd = sys.stdout.fileno()
     if log_file != '':
         # I'm fairly happy that the safety of 'with open...' for this program's context. Let's open
-        # files in 'append' instead of 'write' mode just in case.
-        with open(log_file, 'a') as f_out:
+        # files in 'append' instead of 'write' mode just in case. The command's output is echoed to
+        # the terminal as soon as it arrives, but a large buffer batches the writes to the log file.
+        with open(log_file, 'ab', buffering=LOG_BUFFER_SIZE) as f_out:
             # TODO Catch subprocess.CalledProcessError and gracefully exit the program if its caught
-            for line in subproc_Popen(cmd):
-                print(line, end='')
-                f_out.write(line)
+            for chunk in subproc_Popen(cmd):
+                write_all(stdout_fd, chunk)
+                f_out.write(chunk)
     else:
-        for line in subproc_Popen(cmd):
-            print(line, end='')
+        # Nothing needs to see the output, so the command can write directly to the terminal.
+        # subprocess.call() isn't used as it kills the command if Ctrl-C interrupts the wait, which
+        # would stop a package manager that is trying to shut down cleanly.
+        popen = subprocess.Popen(**popen_args(cmd), stderr=subprocess.STDOUT)
+        return_code = popen.wait()
+        if return_code:
+            raise subprocess.CalledProcessError(return_code, cmd)
+
+def echo_output(output, log_file=''):
+    """Print previously captured command output to the terminal and optionally append to a file.
+
+    Args:
+        output (bytes)  : The output of a command
+        log_file (str)  : The path of the file to append the output to
+    """
+    sys.stdout.flush()
+    write_all(sys.stdout.fileno(), output)
+    if log_file != '':
+        with open(log_file, 'ab') as f_out:
+            f_out.write(output)
 
 def exec_recipe(recipe):
     """Execute a LogPatch recipe.
 
-    See the validate_schema_conf() function for information on the schema of the dict.
+    See RECIPE_SCHEMA for information on the schema of the dict.
+
+    If the recipe has a prefetch_cmd, it is run at the same time as the pre-patch package version
+    command as it must not change installed packages. Its output is shown and logged (along with
+    the patch command's) once the package versions have been recorded so the two don't interleave.
+    Note that anything in the pre-patch package versions that depends on what prefetch_cmd updates
+    (e.g. the "upgradable to" notes from `apt list --installed` after `apt update`) may reflect
+    either the state before or after prefetch_cmd ran.
     
     Args:
         recipe (dict)   : The recipe to execute
     """
     logger.info(f"Executing recipe: {recipe['name']}")
-    if recipe['log_package_version_cmd']:
-        log_file_name = path.join(recipe['log_directory'],
-                                  f"{datetime_now_utc()}_package_versions_pre-patch.log")
-        execute(recipe['package_version_cmd'], log_file_name)
+    # One timestamp identifies all of the log files written by this run of the recipe
+    run_id = datetime_now_utc()
+    patch_log_file_name = ''
     if recipe['log_patch_cmd']:
+        patch_log_file_name = path.join(recipe['log_directory'], f"{run_id}_{recipe['name']}.log")
+    prefetch_cmd = recipe.get('prefetch_cmd')
+    if recipe['log_package_version_cmd']:
         log_file_name = path.join(recipe['log_directory'],
-                                  f"{datetime_now_utc()}_{recipe['name']}.log")
-        execute(recipe['patch_cmd'], log_file_name)
-    else:
-        execute(recipe['patch_cmd'])
+                                  f"{run_id}_package_versions_pre-patch.log")
+        if prefetch_cmd:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                prefetch = executor.submit(subprocess.run, **popen_args(prefetch_cmd),
+                                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+                try:
+                    execute(recipe['package_version_cmd'], log_file_name)
+                finally:
+                    # Show and log the prefetch output even if recording package versions failed
+                    prefetch_result = prefetch.result()
+                    echo_output(prefetch_result.stdout, patch_log_file_name)
+            prefetch_result.check_returncode()
+            prefetch_cmd = None
+        else:
+            execute(recipe['package_version_cmd'], log_file_name)
+    if prefetch_cmd:
+        execute(prefetch_cmd, patch_log_file_name)
+    execute(recipe['patch_cmd'], patch_log_file_name)
     if recipe['log_package_version_cmd']:
         log_file_name = path.join(recipe['log_directory'],
-                                  f"{datetime_now_utc()}_package_versions_post-patch.log")
+                                  f"{run_id}_package_versions_post-patch.log")
         execute(recipe['package_version_cmd'], log_file_name)
 
 if __name__ == "__main__":
@@ -156,17 +498,20 @@ if __name__ == "__main__":
     console.setFormatter(formatter)
     logger.addHandler(console)
 
-    arg_parser = argparse.ArgumentParser(
-                            description="Execute a software upgrade procedure using a package " \
-                                        "manager. Output can optionally be recorded if " \
-                                        "required. This is all controlled via a YAML file.")
-    arg_parser.add_argument('config_path',
-                            help="Path to a logpatch YAML configuration file")
-    arg_parser.add_argument('recipe',
-                            help="The selected recipe to use from the configuration file")
-    args = arg_parser.parse_args()
-    config_path = args.config_path
-    selected_recipe = args.recipe
+    CLOSE_FDS = not disinherit_fds()
+
+    # The command line is just two positional arguments and a flag, so parse it without argparse
+    args = sys.argv[1:]
+    if '-h' in args or '--help' in args:
+        print(USAGE)
+        exit(0)
+    strict = '--strict' in args
+    args = [arg for arg in args if arg != '--strict']
+    # Like argparse, reject unknown options rather than treating them as positional arguments
+    if len(args) != 2 or any(arg.startswith('-') for arg in args):
+        print(USAGE, file=sys.stderr)
+        exit(2)
+    config_path, selected_recipe = args
 
     # Ensure that the configuration file exists
     if not path.exists(config_path):
@@ -176,27 +521,49 @@ if __name__ == "__main__":
         logger.critical(f"Supplied path is not a file: {config_path}")
         exit(1)
     
-    # Parse the configuration file
-    conf = {}
-    with open(config_path, 'r') as f_in:
-        try:
-            conf = yaml.safe_load(f_in)
-            logger.debug(conf)
-        except yaml.YAMLError as excpt:
-            logger.critical(f"Caught yaml.YAMLError:\n{excpt}")
-            exit(1)
+    # Reuse the parsed configuration if the file hasn't changed since the last run, along with the
+    # recipes that have already been validated
+    cache_key = conf_cache_key(config_path)
+    conf, cached_validated_recipes = load_cached_conf(cache_key)
+    if conf is None:
+        # Parse the configuration file
+        with open(config_path, 'r') as f_in:
+            try:
+                conf = yaml.load(f_in, Loader=YamlLoader)
+                logger.debug(conf)
+            except yaml.YAMLError as excpt:
+                logger.critical(f"Caught yaml.YAMLError:\n{excpt}")
+                exit(1)
+    validated_recipes = cached_validated_recipes
 
-    # Validate the schema of the configuration file
-    if validate_schema_conf(conf) != 0:
-        logger.critical(f"The supplied configuration file ({config_path}) does not match the expected schema so this program must exit.")
+    # Validate the schema of the configuration file. Unless asked to be strict, only the selected
+    # recipe is validated as the others won't be used. Every recipe having been validated is
+    # equivalent to validating the whole configuration.
+    if strict and not (isinstance(conf, dict) and validated_recipes.issuperset(conf)):
+        if validate_schema_conf(conf) != 0:
+            logger.critical(f"The supplied configuration file ({config_path}) does not match the expected schema so this program must exit.")
+            exit(1)
+        validated_recipes = frozenset(conf)
+    if not isinstance(conf, dict) or selected_recipe not in conf:
+        logger.critical(f"The supplied configuration file ({config_path}) does not contain the recipe: {selected_recipe}")
         exit(1)
-    
+    if selected_recipe not in validated_recipes:
+        if validate_schema_recipe(conf[selected_recipe]) != 0:
+            logger.critical(f"The recipe {selected_recipe} in the supplied configuration file ({config_path}) does not match the expected schema so this program must exit.")
+            exit(1)
+        validated_recipes = validated_recipes | {selected_recipe}
+    if validated_recipes != cached_validated_recipes:
+        store_cached_conf(cache_key, conf, validated_recipes)
+
     # TODO Check that conf[selected_recipe]['log_directory'] exists, even if we aren't going to log anything
 
     try:
         exec_recipe(conf[selected_recipe])
     except subprocess.CalledProcessError as excpt:
         logger.error(f"Caught subprocess.CalledProcessError:\n{excpt}")
+    except OSError as excpt:
+        # E.g. a log file that cannot be opened or a command that cannot be executed
+        logger.error(f"Caught OSError:\n{excpt}")
     
     exit(0)
 